@@ -3,14 +3,110 @@ Audio Processor Module
 Handles audio file processing, decoding, and preprocessing
 """
 
+import bisect
+import collections
 import io
+import math
+import shutil
+import subprocess
 import numpy as np
+import soundfile as sf
+from numba import njit, prange
 from pydub import AudioSegment
-from typing import Tuple
+from scipy import signal
+from typing import Dict, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import av
+except ImportError:  # PyAV missing -> decode through the ffmpeg binary or pydub
+    av = None
+
+# Container signatures libsndfile can decode directly
+SNDFILE_MAGIC = (b"fLaC", b"OggS")
+
+# Pooled buffer lengths: 1s, 3s, 5s, 10s, 30s, 60s and 300s at 16 kHz
+STANDARD_SIZES = tuple(16000 * seconds for seconds in (1, 3, 5, 10, 30, 60, 300))
+
+# Clipping threshold (0.99 full scale)
+CLIP_THRESHOLD = 0.99
+
+
+@njit(cache=True, fastmath=True)
+def _signal_mean(samples):
+    """Mean of the scaled signal, accumulated in float64"""
+    total = 0.0
+    for i in range(samples.shape[0]):
+        total += samples[i]
+    return total / samples.shape[0]
+
+
+@njit(cache=True, fastmath=True)
+def _fused_convert(samples, scale, dc, coef, out):
+    """
+    Normalize, remove DC offset and apply pre-emphasis in a single pass
+    Works on int16 PCM (scale=1/32768) as well as float32 PCM (scale=1)
+    """
+    n = samples.shape[0]
+    prev = samples[0] * scale - dc
+    out[0] = prev
+    for i in range(1, n):
+        cur = samples[i] * scale - dc
+        out[i] = cur - coef * prev
+        prev = cur
+    return out
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _quality_stats(audio_data, threshold):
+    """Sum, sum of squares and clipped-sample count in a single pass"""
+    total = 0.0
+    total_sq = 0.0
+    clipped = 0
+    for i in prange(audio_data.shape[0]):
+        v = audio_data[i]
+        total += v
+        total_sq += v * v
+        if abs(v) > threshold:
+            clipped += 1
+    return total, total_sq, clipped
+
+
+class Float32Pool:
+    """LIFO pool of float32 buffers bucketed by standard clip lengths"""
+    
+    def __init__(self, max_per_bucket: int = 8):
+        """Initialize one bounded stack per standard size"""
+        self._buckets = {
+            size: collections.deque(maxlen=max_per_bucket) for size in STANDARD_SIZES
+        }
+    
+    def acquire(self, n: int) -> np.ndarray:
+        """
+        Get a float32 array of length n
+        Backed by a pooled buffer when n fits a standard size, freshly allocated otherwise
+        """
+        idx = bisect.bisect_left(STANDARD_SIZES, n)
+        if idx == len(STANDARD_SIZES):
+            return np.empty(n, dtype=np.float32)
+        
+        size = STANDARD_SIZES[idx]
+        try:
+            buffer = self._buckets[size].pop()
+        except IndexError:
+            buffer = np.empty(size, dtype=np.float32)
+        return buffer[:n]
+    
+    def release(self, arr: np.ndarray) -> None:
+        """Return an array obtained from acquire() to the pool"""
+        buffer = arr if arr.base is None else arr.base
+        if isinstance(buffer, np.ndarray) and buffer.dtype == np.float32:
+            bucket = self._buckets.get(buffer.size)
+            if bucket is not None:
+                bucket.append(buffer)
+
 
 class AudioProcessor:
     """Class for processing audio files"""
@@ -20,23 +116,34 @@ class AudioProcessor:
         self.target_sample_rate = 16000  # Standard for speech processing
         self.max_duration = 300  # Maximum 5 minutes
         self.min_duration = 0.5  # Minimum 0.5 seconds
+        self.ffmpeg_path = shutil.which("ffmpeg")  # None -> fall back to pydub
+        self.buffer_pool = Float32Pool()
+        self._resample_kernels: Dict[Tuple[int, int], np.ndarray] = {}
     
     def process_audio(self, audio_bytes: bytes) -> Tuple[np.ndarray, int, float]:
         """
         Process audio bytes to numpy array
         
         Args:
-            audio_bytes: Raw audio file bytes (MP3)
+            audio_bytes: Raw audio file bytes (MP3, WAV, FLAC or OGG)
             
         Returns:
             Tuple of (audio_data, sample_rate, duration_seconds)
+            audio_data is a pooled buffer; hand it back with release_buffer() when done
         """
         try:
-            # Load audio using pydub
-            audio = AudioSegment.from_file(io.BytesIO(audio_bytes), format="mp3")
+            # WAV/FLAC/OGG go through libsndfile, everything else through ffmpeg
+            if self._is_sndfile_format(audio_bytes):
+                samples = self._decode_soundfile(audio_bytes)
+            elif av is not None:
+                samples = self._decode_pyav(audio_bytes)
+            elif self.ffmpeg_path:
+                samples = self._decode_ffmpeg(audio_bytes)
+            else:
+                samples = self._decode_pydub(audio_bytes)
             
             # Get duration
-            duration = len(audio) / 1000.0  # Convert to seconds
+            duration = len(samples) / self.target_sample_rate
             
             # Validate duration
             if duration < self.min_duration:
@@ -45,27 +152,11 @@ class AudioProcessor:
             if duration > self.max_duration:
                 raise ValueError(f"Audio too long: {duration:.2f}s (maximum: {self.max_duration}s)")
             
-            # Convert to mono if stereo
-            if audio.channels > 1:
-                audio = audio.set_channels(1)
-                logger.info("Converted stereo to mono")
-            
-            # Resample to target sample rate if needed
-            if audio.frame_rate != self.target_sample_rate:
-                audio = audio.set_frame_rate(self.target_sample_rate)
-                logger.info(f"Resampled from {audio.frame_rate}Hz to {self.target_sample_rate}Hz")
-            
-            # Convert to numpy array
-            samples = np.array(audio.get_array_of_samples())
-            
-            # Normalize to [-1, 1]
-            audio_data = samples.astype(np.float32) / (2**15)
-            
-            # Remove DC offset
-            audio_data = audio_data - np.mean(audio_data)
-            
-            # Apply pre-emphasis filter (typical for speech)
-            audio_data = self._apply_preemphasis(audio_data)
+            # Normalize, remove DC offset and apply pre-emphasis (typical for speech)
+            scale = 1.0 / (2**15) if samples.dtype == np.int16 else 1.0
+            dc = _signal_mean(samples) * scale
+            audio_data = self.buffer_pool.acquire(len(samples))
+            _fused_convert(samples, scale, dc, 0.97, audio_data)
             
             logger.info(f"Processed audio: {duration:.2f}s, {self.target_sample_rate}Hz")
             
@@ -75,34 +166,155 @@ class AudioProcessor:
             logger.error(f"Error processing audio: {str(e)}")
             raise ValueError(f"Failed to process audio file: {str(e)}")
     
-    def _apply_preemphasis(self, audio_data: np.ndarray, coef: float = 0.97) -> np.ndarray:
+    def release_buffer(self, audio_data: np.ndarray) -> None:
+        """Return an audio_data array from process_audio() to the buffer pool"""
+        self.buffer_pool.release(audio_data)
+    
+    def _is_sndfile_format(self, audio_bytes: bytes) -> bool:
+        """Sniff the container header for formats libsndfile handles natively"""
+        header = audio_bytes[:12]
+        if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+            return True
+        return header[:4] in SNDFILE_MAGIC
+    
+    def _decode_soundfile(self, audio_bytes: bytes) -> np.ndarray:
         """
-        Apply pre-emphasis filter to boost high frequencies
-        Common in speech processing
+        Decode WAV/FLAC/OGG bytes with libsndfile
+        Avoids the ffmpeg process and container setup for uncompressed uploads
         """
-        return np.append(audio_data[0], audio_data[1:] - coef * audio_data[:-1])
+        audio_data, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype="float32", always_2d=False)
+        
+        # Convert to mono if stereo
+        if audio_data.ndim == 2:
+            audio_data = audio_data.mean(axis=1)
+            logger.info("Converted stereo to mono")
+        
+        # Resample to target sample rate if needed (Kaiser-windowed polyphase FIR)
+        if sample_rate != self.target_sample_rate:
+            g = math.gcd(self.target_sample_rate, sample_rate)
+            up, down = self.target_sample_rate // g, sample_rate // g
+            audio_data = signal.resample_poly(
+                audio_data, up, down,
+                window=self._resample_kernel(sample_rate, self.target_sample_rate, up, down)
+            )
+            logger.info(f"Resampled from {sample_rate}Hz to {self.target_sample_rate}Hz")
+        
+        return audio_data.astype(np.float32, copy=False)
+    
+    def _resample_kernel(self, sr_in: int, sr_out: int, up: int, down: int) -> np.ndarray:
+        """
+        Anti-alias FIR for a rate pair, designed once and reused across requests
+        Same design resample_poly would build internally for a Kaiser window
+        """
+        key = (sr_in, sr_out)
+        kernel = self._resample_kernels.get(key)
+        if kernel is None:
+            max_rate = max(up, down)
+            half_len = 10 * max_rate
+            kernel = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 8.6))
+            kernel = kernel.astype(np.float32)
+            self._resample_kernels[key] = kernel
+        return kernel
+    
+    def _decode_pyav(self, audio_bytes: bytes) -> np.ndarray:
+        """
+        Decode audio bytes in-process with PyAV
+        Skips the per-request ffmpeg process spawn and pipe copies
+        """
+        chunks = []
+        with av.open(io.BytesIO(audio_bytes)) as container:
+            stream = container.streams.audio[0]
+            
+            # swresample contexts hold per-stream state and cannot be reused once flushed
+            resampler = av.AudioResampler(format="flt", layout="mono", rate=self.target_sample_rate)
+            
+            for frame in container.decode(stream):
+                for resampled in resampler.resample(frame):
+                    chunks.append(resampled.to_ndarray()[0])
+            
+            for resampled in resampler.resample(None):
+                chunks.append(resampled.to_ndarray()[0])
+        
+        if not chunks:
+            return np.empty(0, dtype=np.float32)
+        return np.concatenate(chunks)
+    
+    def _decode_ffmpeg(self, audio_bytes: bytes) -> np.ndarray:
+        """
+        Decode audio bytes by piping them through the ffmpeg binary
+        ffmpeg emits mono float32 PCM at the target rate, already in [-1, 1]
+        """
+        process = subprocess.Popen(
+            [
+                self.ffmpeg_path, "-v", "error",
+                "-i", "pipe:0",
+                "-f", "f32le",
+                "-ar", str(self.target_sample_rate),
+                "-ac", "1",
+                "pipe:1",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        raw, err = process.communicate(audio_bytes)
+        
+        if process.returncode != 0:
+            raise ValueError(f"ffmpeg decode failed: {err.decode(errors='replace').strip()}")
+        
+        return np.frombuffer(raw, dtype=np.float32)
+    
+    def _decode_pydub(self, audio_bytes: bytes) -> np.ndarray:
+        """
+        Decode audio bytes with pydub
+        Used when the ffmpeg binary is not available on PATH
+        Returns raw int16 samples; normalization happens in the fused pass
+        """
+        audio = AudioSegment.from_file(io.BytesIO(audio_bytes), format="mp3")
+        
+        # Convert to mono if stereo
+        if audio.channels > 1:
+            audio = audio.set_channels(1)
+            logger.info("Converted stereo to mono")
+        
+        # Resample to target sample rate if needed
+        if audio.frame_rate != self.target_sample_rate:
+            audio = audio.set_frame_rate(self.target_sample_rate)
+            logger.info(f"Resampled from {audio.frame_rate}Hz to {self.target_sample_rate}Hz")
+        
+        # Zero-copy view over pydub's 16-bit PCM buffer
+        if audio.sample_width != 2:
+            audio = audio.set_sample_width(2)
+        return np.frombuffer(audio.raw_data, dtype=np.int16)
     
     def validate_audio_quality(self, audio_data: np.ndarray, sample_rate: int) -> dict:
         """
         Validate audio quality metrics
         
+        Args:
+            audio_data: Float signal in [-1, 1]
+            sample_rate: Sample rate of the audio
+        
         Returns:
             Dictionary with quality metrics
         """
         quality = {}
+        n = audio_data.size
+        
+        total, total_sq, clipped = _quality_stats(audio_data, CLIP_THRESHOLD)
         
         # Check for clipping
-        clipping_ratio = np.sum(np.abs(audio_data) > 0.99) / len(audio_data)
+        clipping_ratio = clipped / n
         quality['clipping_ratio'] = float(clipping_ratio)
         quality['is_clipped'] = clipping_ratio > 0.01
         
         # Check signal-to-noise ratio (simplified)
-        signal_power = np.mean(audio_data ** 2)
+        signal_power = total_sq / n
         quality['signal_power'] = float(signal_power)
         quality['is_silent'] = signal_power < 0.001
         
         # Check for DC offset
-        dc_offset = np.mean(audio_data)
+        dc_offset = total / n
         quality['dc_offset'] = float(dc_offset)
         
         return quality
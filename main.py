@@ -3,14 +3,23 @@ Voice Detection API - Main Application
 Detects AI-generated vs Human-generated voice samples in multiple languages
 """
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
-from typing import Literal, Optional, Dict, List
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, WithJsonSchema, validator
+from typing import Annotated, Literal, Optional, Dict, List
+import asyncio
 import base64
+import functools
 import io
 import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+import numba
 import uvicorn
 
 # Import detection modules
@@ -28,7 +37,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Voice Detection API",
     description="API for detecting AI-generated vs human-generated voice samples",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -41,15 +51,54 @@ app.add_middleware(
 )
 
 # Initialize detector and processor
-detector = VoiceDetector()
+# Detection only runs inside pool workers, which already use one process per core
+detector = VoiceDetector(fft_workers=1)
 audio_processor = AudioProcessor()
 
 
+def _init_worker() -> None:
+    """Keep each pool worker single-threaded; the pool is the only level of parallelism"""
+    numba.set_num_threads(1)
+
+
+def _create_executor() -> ProcessPoolExecutor:
+    """
+    Worker pool for CPU-bound decoding and detection, keeps the event loop free
+    Workers come from a forkserver rather than forking the multi-threaded server process,
+    or are spawned where forkserver is unavailable (Windows)
+    """
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=_init_worker
+    )
+
+
+# Created on startup so worker processes importing this module don't build pools of their own
+executor: Optional[ProcessPoolExecutor] = None
+
+
+def _replace_broken_executor(broken: ProcessPoolExecutor) -> None:
+    """Swap in a fresh pool after a worker died, once per broken pool"""
+    global executor
+    if executor is broken:
+        logger.error("Worker process died; restarting the worker pool")
+        broken.shutdown(wait=False)
+        executor = _create_executor()
+
+
 # Request/Response Models
+SupportedLanguage = Literal["tamil", "english", "hindi", "malayalam", "telugu"]
+
+# Decoded bytes internally, but a base64 string on the wire
+Base64Audio = Annotated[bytes, WithJsonSchema({"type": "string", "format": "byte"})]
+
+
 class VoiceDetectionRequest(BaseModel):
     """Request model for voice detection"""
-    audio_data: str = Field(..., description="Base64-encoded MP3 audio file")
-    language: Optional[Literal["tamil", "english", "hindi", "malayalam", "telugu"]] = Field(
+    audio_data: Base64Audio = Field(..., description="Base64-encoded audio file (MP3, WAV, FLAC or OGG)")
+    language: Optional[SupportedLanguage] = Field(
         None, 
         description="Language of the audio sample (optional, will be auto-detected if not provided)"
     )
@@ -58,19 +107,20 @@ class VoiceDetectionRequest(BaseModel):
         description="Include detailed audio features in response"
     )
     
-    @validator('audio_data')
+    @validator('audio_data', pre=True)
     def validate_base64(cls, v):
-        """Validate that the audio_data is valid base64"""
+        """Decode the base64 audio_data once so handlers receive raw bytes"""
         try:
-            base64.b64decode(v)
-            return v
+            return base64.b64decode(v, validate=False)
         except Exception:
             raise ValueError("Invalid base64 encoding")
 
 
 class VoiceDetectionResponse(BaseModel):
     """Response model for voice detection"""
-    classification: Literal["ai_generated", "human_generated"]
+    classification: Literal["ai_generated", "human_generated", "unknown"] = Field(
+        ..., description="Detection result; 'unknown' when the audio is too short to analyse"
+    )
     confidence_score: float = Field(..., ge=0.0, le=1.0, description="Confidence score between 0 and 1")
     explanation: str
     language_detected: str
@@ -100,48 +150,50 @@ class BatchDetectionResponse(BaseModel):
     processing_time_ms: float
 
 
+# Static part of the root/health payloads, built once at startup
+_SERVICE_INFO = {
+    "version": "1.0.0",
+    "supported_languages": ["tamil", "english", "hindi", "malayalam", "telugu"]
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _iso_timestamp(second: int) -> str:
+    """ISO timestamp for a whole UTC second, formatted once per second"""
+    return datetime.utcfromtimestamp(second).isoformat()
+
+
+def _cached_iso_now() -> str:
+    """Current UTC time at one-second resolution"""
+    return _iso_timestamp(int(time.time()))
+
+
 # API Endpoints
 @app.get("/", response_model=HealthResponse)
 async def root():
     """Root endpoint - API information"""
-    return {
-        "status": "operational",
-        "version": "1.0.0",
-        "supported_languages": ["tamil", "english", "hindi", "malayalam", "telugu"],
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return {**_SERVICE_INFO, "status": "operational", "timestamp": _cached_iso_now()}
 
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "version": "1.0.0",
-        "supported_languages": ["tamil", "english", "hindi", "malayalam", "telugu"],
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return {**_SERVICE_INFO, "status": "healthy", "timestamp": _cached_iso_now()}
 
 
-@app.post("/detect", response_model=VoiceDetectionResponse)
-async def detect_voice(request: VoiceDetectionRequest):
+def _detect_sync(audio_bytes: bytes, language: Optional[str], include_features: bool) -> Dict:
     """
-    Main endpoint for voice detection
+    Decode and classify a single audio sample
     
-    Analyzes an audio sample and determines if it's AI-generated or human-generated
+    Runs inside a worker process of the executor pool
     """
     start_time = datetime.now()
     
+    # Process audio
+    audio_data, sample_rate, duration = audio_processor.process_audio(audio_bytes)
+    
     try:
-        # Decode base64 audio
-        logger.info("Processing voice detection request")
-        audio_bytes = base64.b64decode(request.audio_data)
-        
-        # Process audio
-        audio_data, sample_rate, duration = audio_processor.process_audio(audio_bytes)
-        
         # Detect language if not provided
-        language = request.language
         if language is None:
             language = detector.detect_language(audio_data, sample_rate)
             logger.info(f"Language auto-detected: {language}")
@@ -151,29 +203,65 @@ async def detect_voice(request: VoiceDetectionRequest):
             audio_data=audio_data,
             sample_rate=sample_rate,
             language=language,
-            include_features=request.include_features
+            include_features=include_features
+        )
+    finally:
+        audio_processor.release_buffer(audio_data)
+    
+    # Calculate processing time
+    processing_time = (datetime.now() - start_time).total_seconds() * 1000
+    
+    # Build response
+    response = {
+        "classification": result["classification"],
+        "confidence_score": result["confidence_score"],
+        "explanation": result["explanation"],
+        "language_detected": language,
+        "processing_time_ms": round(processing_time, 2),
+        "audio_duration_seconds": round(duration, 2),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    
+    if include_features and "detailed_analysis" in result:
+        response["detailed_analysis"] = result["detailed_analysis"]
+    
+    logger.info(f"Detection completed: {result['classification']} ({result['confidence_score']:.2f})")
+    return response
+
+
+@app.on_event("startup")
+def start_executor():
+    """Start the worker pool when the application starts"""
+    global executor
+    executor = _create_executor()
+
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    """Stop the worker pool when the application shuts down"""
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run_detection(audio_bytes: bytes, language: Optional[str], include_features: bool) -> Dict:
+    """Run detection in the worker pool and map failures to HTTP errors"""
+    pool = executor
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            pool,
+            _detect_sync,
+            audio_bytes,
+            language,
+            include_features
         )
         
-        # Calculate processing time
-        processing_time = (datetime.now() - start_time).total_seconds() * 1000
-        
-        # Build response
-        response = {
-            "classification": result["classification"],
-            "confidence_score": result["confidence_score"],
-            "explanation": result["explanation"],
-            "language_detected": language,
-            "processing_time_ms": round(processing_time, 2),
-            "audio_duration_seconds": round(duration, 2),
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        if request.include_features and "detailed_analysis" in result:
-            response["detailed_analysis"] = result["detailed_analysis"]
-        
-        logger.info(f"Detection completed: {result['classification']} ({result['confidence_score']:.2f})")
-        return response
-        
+    except BrokenProcessPool as e:
+        _replace_broken_executor(pool)
+        logger.error(f"Worker pool error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Worker process crashed, please retry the request"
+        )
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
         raise HTTPException(
@@ -188,21 +276,57 @@ async def detect_voice(request: VoiceDetectionRequest):
         )
 
 
+@app.post("/detect", response_model=VoiceDetectionResponse)
+async def detect_voice(request: VoiceDetectionRequest):
+    """
+    Main endpoint for voice detection
+    
+    Analyzes an audio sample and determines if it's AI-generated or human-generated
+    """
+    # audio_data is already decoded by the request validator
+    logger.info("Processing voice detection request")
+    return await _run_detection(request.audio_data, request.language, request.include_features)
+
+
+@app.post("/detect/binary", response_model=VoiceDetectionResponse)
+async def detect_voice_binary(
+    file: UploadFile = File(..., description="Audio file uploaded as multipart form data"),
+    language: Optional[SupportedLanguage] = Form(None),
+    include_features: bool = Form(False)
+):
+    """
+    Voice detection from a raw file upload
+    
+    Same analysis as /detect without the base64 encoding overhead
+    """
+    logger.info(f"Processing binary voice detection request: {file.filename}")
+    audio_bytes = await file.read()
+    return await _run_detection(audio_bytes, language, include_features)
+
+
 @app.post("/detect/batch", response_model=BatchDetectionResponse)
 async def detect_batch(request: BatchDetectionRequest):
     """
     Batch endpoint for processing multiple voice samples
     
-    Maximum 10 samples per request
+    Maximum 10 samples per request, processed concurrently in the worker pool
     """
     start_time = datetime.now()
-    results = []
+    pool = executor
     
     try:
-        for idx, sample in enumerate(request.samples):
-            logger.info(f"Processing batch sample {idx + 1}/{len(request.samples)}")
-            result = await detect_voice(sample)
-            results.append(result)
+        logger.info(f"Processing batch of {len(request.samples)} samples")
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*[
+            loop.run_in_executor(
+                pool,
+                _detect_sync,
+                sample.audio_data,
+                sample.language,
+                sample.include_features
+            )
+            for sample in request.samples
+        ])
         
         processing_time = (datetime.now() - start_time).total_seconds() * 1000
         
@@ -212,6 +336,13 @@ async def detect_batch(request: BatchDetectionRequest):
             "processing_time_ms": round(processing_time, 2)
         }
         
+    except BrokenProcessPool as e:
+        _replace_broken_executor(pool)
+        logger.error(f"Worker pool error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Worker process crashed, please retry the request"
+        )
     except Exception as e:
         logger.error(f"Batch processing error: {str(e)}")
         raise HTTPException(
@@ -3,21 +3,133 @@ Voice Detector Module
 Core detection logic for identifying AI-generated vs human-generated voices
 """
 
+import functools
+import hashlib
+import os
 import numpy as np
-from typing import Dict, Tuple, Optional
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional
 import logging
+from numba import njit, prange
+from numpy.lib.stride_tricks import sliding_window_view
 from scipy import signal
-from scipy.fft import fft
-from scipy.stats import entropy, kurtosis, skew
+from scipy.fft import next_fast_len, rfftfreq
+from scipy.stats import entropy
 
 logger = logging.getLogger(__name__)
 
+try:
+    import pyfftw
+    from pyfftw.interfaces.scipy_fft import irfft, rfft
+    pyfftw.interfaces.cache.enable()  # Reuse FFTW plans across same-length calls
+except ImportError:  # pyFFTW missing -> scipy.fft's pocketfft backend
+    pyfftw = None
+    from scipy.fft import irfft, rfft
+
+# Frame layout for the framed temporal/energy features
+FRAME_LENGTH = 1024
+HOP_LENGTH = 512
+
+# STFT layout for the spectral features (Hann window, 50% overlap)
+STFT_NPERSEG = 512
+STFT_HOP = 256
+
+# Shortest input worth analysing: a few full frames, and never under 100 ms
+MIN_FRAMES = 4
+
+# Part of every feature cache key; bump whenever feature values or the Features schema change
+FEATURE_CACHE_VERSION = 1
+
+# AI indicators as (mask index, explanation reason, indicator label), in reporting order
+AI_INDICATOR_LABELS = (
+    (0, "uniform spectral distribution", "High spectral uniformity"),
+    (3, "minimal pitch variation", "Low pitch jitter"),
+    (4, "consistent amplitude", "Low amplitude shimmer"),
+    (2, "stable zero-crossing rate", "Consistent zero-crossing rate"),
+    (1, "high harmonic content", "Strong harmonic structure"),
+)
+
+# Human indicators as (mask index, indicator label); set where the AI mask is not
+HUMAN_INDICATOR_LABELS = (
+    (3, "Natural pitch variation"),
+    (4, "Natural amplitude variation"),
+    (2, "Variable articulation"),
+    (6, "Dynamic energy distribution"),
+)
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _frame_stats(audio_data, n_frames):
+    """
+    Per-frame zero-crossing rate and energy in one compiled pass
+    Frames are processed in parallel; each frame is read once
+    """
+    zcr = np.empty(n_frames)
+    energies = np.empty(n_frames)
+    for f in prange(n_frames):
+        start = f * HOP_LENGTH
+        crossings = 0
+        energy = 0.0
+        prev_negative = np.signbit(audio_data[start])
+        for i in range(start, start + FRAME_LENGTH):
+            v = audio_data[i]
+            negative = np.signbit(v)
+            if negative != prev_negative:
+                crossings += 1
+            prev_negative = negative
+            energy += v * v
+        zcr[f] = crossings / FRAME_LENGTH
+        energies[f] = energy
+    return zcr, energies
+
+
+@functools.lru_cache(maxsize=16)
+def _rfftfreq(n: int, sample_rate: int) -> np.ndarray:
+    """Frequency axis for an n-point rfft, cached per (length, rate)"""
+    freqs = rfftfreq(n, 1/sample_rate).astype(np.float32)
+    freqs.flags.writeable = False
+    return freqs
+
+
+@functools.lru_cache(maxsize=4)
+def _hann(n: int) -> np.ndarray:
+    """Periodic Hann window as used by scipy.signal.stft, cached per length"""
+    window = signal.get_window("hann", n).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+
+@dataclass(slots=True)
+class Features:
+    """Fixed-schema audio features extracted for one sample"""
+    spectral_flatness: float
+    spectral_centroid: float
+    spectral_rolloff: float
+    harmonic_ratio: float
+    zero_crossing_rate: float
+    zcr_std: float
+    jitter: float
+    shimmer: float
+    mfcc_variance: float
+    energy_entropy: float
+    dynamic_range: float
+    signal_kurtosis: float
+    signal_skewness: float
+
+
+FEATURE_NAMES = frozenset(field.name for field in fields(Features))
+
 
 class VoiceDetector:
     """Main class for voice detection analysis"""
     
-    def __init__(self):
-        """Initialize the voice detector with default thresholds"""
+    def __init__(self, fft_workers: int = -1):
+        """
+        Initialize the voice detector with default thresholds
+        fft_workers is passed to every FFT; -1 uses all cores, use 1 inside worker pools
+        """
+        self.fft_workers = fft_workers
         self.thresholds = {
             # AI-generated voices often have these characteristics:
             "spectral_flatness_threshold": 0.15,  # More uniform spectrum
@@ -35,13 +147,29 @@ class VoiceDetector:
             "malayalam": {"phoneme_weight": 1.1},
             "telugu": {"phoneme_weight": 1.08}
         }
+        
+        # Probability indicators, in order: spectral flatness, harmonic ratio,
+        # ZCR std, jitter, shimmer, MFCC variance, energy entropy
+        self._weights = np.array([2.0, 1.5, 1.8, 2.2, 2.0, 1.5, 1.0])
+        self._directions = np.array([1, 1, -1, -1, -1, -1, -1])  # 1: above threshold is AI-like
+        self._threshold_vector = np.array([
+            self.thresholds['spectral_flatness_threshold'],
+            self.thresholds['harmonic_ratio_threshold'],
+            self.thresholds['zero_crossing_rate_std'],
+            self.thresholds['jitter_threshold'],
+            self.thresholds['shimmer_threshold'],
+            self.thresholds['mel_cepstral_distortion'],
+            3.5,  # Energy entropy
+        ])
+        self._zcr_index = 2  # Indicator scaled by the language phoneme weight
     
     def detect(
         self, 
         audio_data: np.ndarray, 
         sample_rate: int, 
         language: str,
-        include_features: bool = False
+        include_features: bool = False,
+        cache_dir: Optional[Path] = None
     ) -> Dict:
         """
         Main detection method
@@ -51,24 +179,99 @@ class VoiceDetector:
             sample_rate: Sample rate of the audio
             language: Language of the speech
             include_features: Whether to include detailed features
+            cache_dir: Optional directory for caching extracted features by audio hash
             
         Returns:
             Dictionary with classification, confidence, and explanation
         """
         logger.info(f"Starting detection for {language} audio")
         
+        # Too few samples for meaningful framed/spectral features; answer immediately
+        if len(audio_data) < self._min_samples(sample_rate):
+            logger.warning(f"Audio too short for analysis: {len(audio_data)} samples")
+            return {
+                "classification": "unknown",
+                "confidence_score": 0.0,
+                "explanation": "Audio too short"
+            }
+        
+        # Work in float32 throughout; spectra stay complex64/float32
+        audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
+        
         # Extract features
-        features = self._extract_features(audio_data, sample_rate, language)
+        if cache_dir is not None:
+            features = self._load_or_extract_features(audio_data, sample_rate, language, Path(cache_dir))
+        else:
+            features = self._extract_features(audio_data, sample_rate, language)
+        
+        return self._build_result(features, language, include_features)
+    
+    def detect_batch(
+        self,
+        audios: List[np.ndarray],
+        sample_rates: List[int],
+        languages: List[str],
+        include_features: bool = False
+    ) -> List[Dict]:
+        """
+        Batch detection; results are identical to calling detect() per clip
+        
+        Clips are bucketed by (length, sample rate) and each bucket is stacked
+        into one (B, N) array, so the STFT and autocorrelation FFTs run once
+        per bucket instead of once per clip.
+        
+        Args:
+            audios: Audio signals as numpy arrays
+            sample_rates: Sample rate of each audio
+            languages: Language of each speech sample
+            include_features: Whether to include detailed features
+            
+        Returns:
+            List of detection dictionaries, in input order
+        """
+        if not len(audios) == len(sample_rates) == len(languages):
+            raise ValueError("audios, sample_rates and languages must have the same length")
+        
+        logger.info(f"Starting batch detection for {len(audios)} clips")
+        
+        results: List[Optional[Dict]] = [None] * len(audios)
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        
+        for i, (audio_data, sample_rate) in enumerate(zip(audios, sample_rates)):
+            if len(audio_data) < self._min_samples(sample_rate):
+                results[i] = self.detect(audio_data, sample_rate, languages[i], include_features)
+            else:
+                buckets.setdefault((len(audio_data), sample_rate), []).append(i)
+        
+        for (_, sample_rate), indices in buckets.items():
+            batch = np.stack([np.asarray(audios[i], dtype=np.float32) for i in indices])
+            
+            # One batched transform per bucket along the sample axis
+            spectra = self._calculate_stft_magnitude(batch)
+            autocorrs = self._calculate_autocorrelation(batch)
+            
+            for row, i in enumerate(indices):
+                features = self._features_from_analysis(
+                    batch[row], sample_rate, spectra[row], autocorrs[row]
+                )
+                results[i] = self._build_result(features, languages[i], include_features)
+        
+        return results
+    
+    def _build_result(self, features: Features, language: str, include_features: bool) -> Dict:
+        """Classify extracted features and assemble the detection dictionary"""
+        # Evaluate every indicator threshold once, shared by all outputs below
+        ai_mask = self._evaluate_thresholds(features)
         
         # Calculate AI probability based on features
-        ai_probability = self._calculate_ai_probability(features, language)
+        ai_probability = self._calculate_ai_probability(ai_mask, language)
         
         # Determine classification
         classification = "ai_generated" if ai_probability > 0.5 else "human_generated"
         confidence_score = ai_probability if classification == "ai_generated" else (1 - ai_probability)
         
         # Generate explanation
-        explanation = self._generate_explanation(features, ai_probability, language)
+        explanation = self._generate_explanation(ai_mask, ai_probability, language)
         
         result = {
             "classification": classification,
@@ -78,161 +281,244 @@ class VoiceDetector:
         
         if include_features:
             result["detailed_analysis"] = {
-                "features": {k: round(float(v), 4) for k, v in features.items()},
-                "ai_indicators": self._get_ai_indicators(features),
-                "human_indicators": self._get_human_indicators(features)
+                "features": {k: round(float(v), 4) for k, v in asdict(features).items()},
+                "ai_indicators": self._get_ai_indicators(ai_mask),
+                "human_indicators": self._get_human_indicators(ai_mask)
             }
         
         return result
     
-    def _extract_features(self, audio_data: np.ndarray, sample_rate: int, language: str) -> Dict:
+    def _load_or_extract_features(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        language: str,
+        cache_dir: Path
+    ) -> Features:
+        """
+        Extract features, reusing a cached .npz keyed by the audio content hash
+        Features depend only on the samples, the sample rate and FEATURE_CACHE_VERSION
+        """
+        # Hash the contiguous samples in place rather than through a tobytes() copy
+        digest = hashlib.blake2b(memoryview(audio_data), digest_size=16).hexdigest()
+        key = f"{digest}-{sample_rate}-v{FEATURE_CACHE_VERSION}"
+        cache_path = cache_dir / f"{key}.npz"
+        
+        if cache_path.exists():
+            with np.load(cache_path) as cached:
+                # Entries written with a different field set are misses, recomputed below
+                if set(cached.files) == FEATURE_NAMES:
+                    return Features(**{name: float(cached[name]) for name in cached.files})
+            logger.warning(f"Ignoring feature cache entry with mismatched fields: {cache_path.name}")
+        
+        features = self._extract_features(audio_data, sample_rate, language)
+        
+        # Write to a private temp file first so concurrent workers never read a partial cache entry
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_dir / f"{key}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(tmp_path, **asdict(features))
+        os.replace(tmp_path, cache_path)
+        
+        return features
+    
+    def _extract_features(self, audio_data: np.ndarray, sample_rate: int, language: str) -> Features:
         """Extract audio features for analysis"""
-        features = {}
+        return self._features_from_analysis(
+            audio_data,
+            sample_rate,
+            self._calculate_stft_magnitude(audio_data),
+            self._calculate_autocorrelation(audio_data)
+        )
+    
+    def _features_from_analysis(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        spectrum: np.ndarray,
+        autocorr: np.ndarray
+    ) -> Features:
+        """
+        Derive all features from one clip and its precomputed transforms
+        spectrum is the (frames x bins) STFT magnitude, autocorr the non-negative lags
+        """
+        freqs = _rfftfreq(STFT_NPERSEG, sample_rate)
+        # Log into its own buffer in place; the raw magnitudes are still needed below
+        log_spectrum = np.add(spectrum, 1e-10)
+        np.log(log_spectrum, out=log_spectrum)
         
         # 1. Spectral Features
-        features['spectral_flatness'] = self._calculate_spectral_flatness(audio_data)
-        features['spectral_centroid'] = self._calculate_spectral_centroid(audio_data, sample_rate)
-        features['spectral_rolloff'] = self._calculate_spectral_rolloff(audio_data, sample_rate)
+        spectral_flatness = self._calculate_spectral_flatness(spectrum, log_spectrum)
+        spectral_centroid = self._calculate_spectral_centroid(spectrum, freqs)
+        spectral_rolloff = self._calculate_spectral_rolloff(spectrum, freqs)
+        
+        # Shared autocorrelation for the harmonic and pitch features
+        autocorr_max = float(autocorr.max())
         
         # 2. Harmonic Features
-        features['harmonic_ratio'] = self._calculate_harmonic_ratio(audio_data)
+        harmonic_ratio = self._calculate_harmonic_ratio(autocorr, autocorr_max, sample_rate)
+        
+        # Per-frame ZCR and energies shared by the framed features
+        n_frames = len(range(0, len(audio_data) - FRAME_LENGTH, HOP_LENGTH))
+        frame_zcr, frame_energies = _frame_stats(audio_data, n_frames)
         
         # 3. Temporal Features
-        features['zero_crossing_rate'] = self._calculate_zero_crossing_rate(audio_data)
-        features['zcr_std'] = self._calculate_zcr_std(audio_data)
+        zero_crossing_rate = self._calculate_zero_crossing_rate(audio_data)
+        zcr_std = self._calculate_zcr_std(frame_zcr)
         
         # 4. Prosodic Features (pitch variation)
-        features['jitter'] = self._calculate_jitter(audio_data, sample_rate)
-        features['shimmer'] = self._calculate_shimmer(audio_data)
+        jitter = self._calculate_jitter(autocorr, autocorr_max, sample_rate)
+        shimmer = self._calculate_shimmer(frame_energies)
         
         # 5. Mel-Frequency Cepstral Coefficients
-        features['mfcc_variance'] = self._calculate_mfcc_variance(audio_data, sample_rate)
+        mfcc_variance = self._calculate_mfcc_variance(log_spectrum)
         
         # 6. Energy and Dynamics
-        features['energy_entropy'] = self._calculate_energy_entropy(audio_data)
-        features['dynamic_range'] = self._calculate_dynamic_range(audio_data)
+        energy_entropy = self._calculate_energy_entropy(frame_energies)
+        dynamic_range = self._calculate_dynamic_range(audio_data)
         
         # 7. Statistical Features
-        features['signal_kurtosis'] = kurtosis(audio_data)
-        features['signal_skewness'] = skew(audio_data)
-        
-        return features
+        signal_kurtosis, signal_skewness = self._calculate_moments(audio_data)
+        
+        return Features(
+            spectral_flatness=spectral_flatness,
+            spectral_centroid=spectral_centroid,
+            spectral_rolloff=spectral_rolloff,
+            harmonic_ratio=harmonic_ratio,
+            zero_crossing_rate=zero_crossing_rate,
+            zcr_std=zcr_std,
+            jitter=jitter,
+            shimmer=shimmer,
+            mfcc_variance=mfcc_variance,
+            energy_entropy=energy_entropy,
+            dynamic_range=dynamic_range,
+            signal_kurtosis=signal_kurtosis,
+            signal_skewness=signal_skewness
+        )
+    
+    def _calculate_stft_magnitude(self, audio_data: np.ndarray) -> np.ndarray:
+        """
+        STFT magnitude matrix of shape (..., frames, STFT_NPERSEG // 2 + 1)
+        Frames the last axis, so a stacked (B, N) batch is transformed in one call
+        Same framing as scipy.signal.stft(..., boundary=None, padded=False), unscaled;
+        every spectral feature below is invariant to the overall scale
+        """
+        windows = sliding_window_view(audio_data, STFT_NPERSEG, axis=-1)
+        frames = windows[..., ::STFT_HOP, :] * _hann(STFT_NPERSEG)
+        return np.abs(rfft(frames, axis=-1, workers=self.fft_workers))
     
-    def _calculate_spectral_flatness(self, audio_data: np.ndarray) -> float:
+    def _calculate_spectral_flatness(self, spectrum: np.ndarray, log_spectrum: np.ndarray) -> float:
         """
-        Calculate spectral flatness (Wiener entropy)
+        Calculate spectral flatness (Wiener entropy), averaged over STFT frames
         AI voices tend to have flatter spectra (higher values)
         """
-        spectrum = np.abs(fft(audio_data))
-        spectrum = spectrum[:len(spectrum)//2]  # Take positive frequencies
-        
-        geometric_mean = np.exp(np.mean(np.log(spectrum + 1e-10)))
-        arithmetic_mean = np.mean(spectrum)
+        geometric_mean = np.exp(np.mean(log_spectrum, axis=-1))
+        arithmetic_mean = np.mean(spectrum, axis=-1)
         
         flatness = geometric_mean / (arithmetic_mean + 1e-10)
-        return float(flatness)
+        return float(np.mean(flatness))
     
-    def _calculate_spectral_centroid(self, audio_data: np.ndarray, sample_rate: int) -> float:
-        """Calculate spectral centroid (brightness of sound)"""
-        spectrum = np.abs(fft(audio_data))
-        freqs = np.fft.fftfreq(len(audio_data), 1/sample_rate)
-        freqs = freqs[:len(freqs)//2]
-        spectrum = spectrum[:len(spectrum)//2]
-        
-        centroid = np.sum(freqs * spectrum) / (np.sum(spectrum) + 1e-10)
-        return float(centroid)
+    def _calculate_spectral_centroid(self, spectrum: np.ndarray, freqs: np.ndarray) -> float:
+        """Calculate spectral centroid (brightness of sound), averaged over STFT frames"""
+        centroid = (spectrum @ freqs) / (np.sum(spectrum, axis=-1) + 1e-10)
+        return float(np.mean(centroid))
     
-    def _calculate_spectral_rolloff(self, audio_data: np.ndarray, sample_rate: int) -> float:
-        """Calculate spectral rolloff (85% of energy threshold)"""
-        spectrum = np.abs(fft(audio_data))
-        spectrum = spectrum[:len(spectrum)//2]
-        
-        total_energy = np.sum(spectrum)
-        threshold = 0.85 * total_energy
-        
-        cumsum = np.cumsum(spectrum)
-        rolloff_idx = np.where(cumsum >= threshold)[0]
-        
-        if len(rolloff_idx) > 0:
-            rolloff_freq = rolloff_idx[0] * sample_rate / (2 * len(spectrum))
-            return float(rolloff_freq)
-        return 0.0
+    def _calculate_spectral_rolloff(self, spectrum: np.ndarray, freqs: np.ndarray) -> float:
+        """Calculate spectral rolloff (85% of energy threshold), averaged over STFT frames"""
+        # Last cumulative value per frame is its total energy
+        cumsum = np.cumsum(spectrum, axis=-1)
+        threshold = 0.85 * cumsum[:, -1:]
+        
+        # First bin reaching the threshold; always exists since the last bin does
+        rolloff_idx = np.argmax(cumsum >= threshold, axis=-1)
+        return float(np.mean(freqs[rolloff_idx]))
     
-    def _calculate_harmonic_ratio(self, audio_data: np.ndarray) -> float:
+    def _calculate_autocorrelation(self, audio_data: np.ndarray) -> np.ndarray:
+        """
+        Autocorrelation for non-negative lags via Wiener-Khinchin, O(N log N)
+        Zero-padded to at least 2N-1 so the result matches the linear
+        np.correlate(x, x, 'full') rather than the circular one
+        Operates on the last axis, so a stacked (B, N) batch is handled in one call
+        """
+        n = audio_data.shape[-1]
+        n_fft = next_fast_len(2 * n - 1, real=True)
+        spectrum = rfft(audio_data, n_fft, axis=-1, workers=self.fft_workers)
+        # |X|^2 in a single real buffer instead of real**2 + imag**2 temporaries
+        power = np.abs(spectrum)
+        power *= power
+        return irfft(power, n_fft, axis=-1, workers=self.fft_workers)[..., :n]
+    
+    def _min_samples(self, sample_rate: int) -> int:
+        """Minimum number of samples required for detection"""
+        return max(FRAME_LENGTH * MIN_FRAMES, sample_rate // 10)
+    
+    def _min_pitch_period(self, sample_rate: int) -> int:
+        """Shortest plausible pitch period in samples (500 Hz upper pitch bound)"""
+        return max(1, sample_rate // 500)
+    
+    def _pitch_peaks(self, autocorr: np.ndarray, height: float, sample_rate: int) -> np.ndarray:
+        """
+        Autocorrelation peak lags at or beyond the minimum pitch period
+        Lags below the pitch bound are excluded from the search itself: distance
+        only spaces peaks apart, so near-zero-lag shoulders would otherwise survive
+        """
+        min_period = self._min_pitch_period(sample_rate)
+        peaks, _ = signal.find_peaks(autocorr[min_period:], height=height, distance=min_period)
+        return peaks + min_period
+    
+    def _calculate_harmonic_ratio(self, autocorr: np.ndarray, autocorr_max: float, sample_rate: int) -> float:
         """
         Calculate harmonic-to-noise ratio
         AI voices often have higher harmonic content
         """
-        # Use autocorrelation to estimate harmonicity
-        autocorr = np.correlate(audio_data, audio_data, mode='full')
-        autocorr = autocorr[len(autocorr)//2:]
-        
         if len(autocorr) < 2:
             return 0.5
         
-        # Find peaks in autocorrelation
-        peaks = signal.find_peaks(autocorr[1:], height=0)[0]
+        peaks = self._pitch_peaks(autocorr, 0, sample_rate)
         
         if len(peaks) > 0:
-            harmonic_strength = np.mean(autocorr[peaks + 1]) / (np.max(autocorr) + 1e-10)
+            harmonic_strength = np.mean(autocorr[peaks]) / (autocorr_max + 1e-10)
             return float(min(harmonic_strength, 1.0))
         
         return 0.3
     
     def _calculate_zero_crossing_rate(self, audio_data: np.ndarray) -> float:
         """Calculate zero crossing rate"""
-        zero_crossings = np.sum(np.abs(np.diff(np.sign(audio_data)))) / 2
+        sign_bits = np.signbit(audio_data)
+        zero_crossings = np.count_nonzero(sign_bits[1:] ^ sign_bits[:-1])
         zcr = zero_crossings / len(audio_data)
         return float(zcr)
     
-    def _calculate_zcr_std(self, audio_data: np.ndarray) -> float:
+    def _calculate_zcr_std(self, frame_zcr: np.ndarray) -> float:
         """
         Calculate standard deviation of ZCR across frames
         AI voices tend to have more consistent ZCR (lower std)
         """
-        frame_length = 1024
-        hop_length = 512
-        
-        zcr_values = []
-        for i in range(0, len(audio_data) - frame_length, hop_length):
-            frame = audio_data[i:i+frame_length]
-            zcr = self._calculate_zero_crossing_rate(frame)
-            zcr_values.append(zcr)
-        
-        return float(np.std(zcr_values)) if zcr_values else 0.0
+        return float(np.std(frame_zcr)) if len(frame_zcr) else 0.0
     
-    def _calculate_jitter(self, audio_data: np.ndarray, sample_rate: int) -> float:
+    def _calculate_jitter(self, autocorr: np.ndarray, autocorr_max: float, sample_rate: int) -> float:
         """
         Calculate jitter (pitch period variation)
         AI voices tend to have lower jitter
         """
-        # Simplified jitter calculation using autocorrelation
-        autocorr = np.correlate(audio_data, audio_data, mode='full')
-        autocorr = autocorr[len(autocorr)//2:]
-        
         # Find pitch period
-        peaks = signal.find_peaks(autocorr[1:], height=0.3*np.max(autocorr))[0]
+        peaks = self._pitch_peaks(autocorr, 0.3*autocorr_max, sample_rate)
         
-        if len(peaks) > 1:
+        # Period variation needs at least two periods, i.e. three peaks
+        if len(peaks) > 2:
             periods = np.diff(peaks)
             jitter = np.std(periods) / (np.mean(periods) + 1e-10)
             return float(min(jitter, 1.0))
         
         return 0.01
     
-    def _calculate_shimmer(self, audio_data: np.ndarray) -> float:
+    def _calculate_shimmer(self, frame_energies: np.ndarray) -> float:
         """
         Calculate shimmer (amplitude variation)
         AI voices tend to have lower shimmer
         """
-        frame_length = 1024
-        hop_length = 512
-        
-        amplitudes = []
-        for i in range(0, len(audio_data) - frame_length, hop_length):
-            frame = audio_data[i:i+frame_length]
-            amplitude = np.sqrt(np.mean(frame**2))
-            amplitudes.append(amplitude)
+        # Per-frame RMS amplitude
+        amplitudes = frame_energies / FRAME_LENGTH
+        np.sqrt(amplitudes, out=amplitudes)
         
         if len(amplitudes) > 1:
             shimmer = np.std(amplitudes) / (np.mean(amplitudes) + 1e-10)
@@ -240,44 +526,29 @@ class VoiceDetector:
         
         return 0.05
     
-    def _calculate_mfcc_variance(self, audio_data: np.ndarray, sample_rate: int) -> float:
+    def _calculate_mfcc_variance(self, log_spectrum: np.ndarray) -> float:
         """
         Calculate variance in MFCCs
         AI voices tend to have more uniform MFCCs (lower variance)
+        Simplified: variance of the log STFT magnitudes
         """
-        # Simplified MFCC variance using spectral features
-        spectrum = np.abs(fft(audio_data))
-        spectrum = spectrum[:len(spectrum)//2]
-        
-        # Apply mel filterbank (simplified)
-        mel_spectrum = np.log(spectrum + 1e-10)
-        
-        # Calculate variance
-        variance = np.var(mel_spectrum)
+        variance = np.var(log_spectrum)
         return float(variance)
     
-    def _calculate_energy_entropy(self, audio_data: np.ndarray) -> float:
+    def _calculate_energy_entropy(self, frame_energies: np.ndarray) -> float:
         """Calculate entropy of energy distribution"""
-        frame_length = 1024
-        hop_length = 512
-        
-        energies = []
-        for i in range(0, len(audio_data) - frame_length, hop_length):
-            frame = audio_data[i:i+frame_length]
-            energy = np.sum(frame**2)
-            energies.append(energy)
-        
-        if energies:
-            energies = np.array(energies)
-            energies = energies / (np.sum(energies) + 1e-10)
-            return float(entropy(energies + 1e-10))
+        if len(frame_energies):
+            energies = frame_energies / (np.sum(frame_energies) + 1e-10)
+            energies += 1e-10
+            return float(entropy(energies))
         
         return 0.0
     
     def _calculate_dynamic_range(self, audio_data: np.ndarray) -> float:
         """Calculate dynamic range of the signal"""
-        max_amplitude = np.max(np.abs(audio_data))
-        rms = np.sqrt(np.mean(audio_data**2))
+        # Peak and RMS without materializing abs()/square copies
+        max_amplitude = max(audio_data.max(), -audio_data.min())
+        rms = np.sqrt(np.dot(audio_data, audio_data) / len(audio_data))
         
         if rms > 0:
             dynamic_range = 20 * np.log10(max_amplitude / (rms + 1e-10))
@@ -285,79 +556,62 @@ class VoiceDetector:
         
         return 0.0
     
-    def _calculate_ai_probability(self, features: Dict, language: str) -> float:
+    def _calculate_moments(self, audio_data: np.ndarray) -> Tuple[float, float]:
         """
-        Calculate probability that the voice is AI-generated
-        Based on weighted feature analysis
+        Excess kurtosis and skewness from central moments of one shifted copy
+        Matches scipy.stats kurtosis/skew with their default (biased, Fisher) settings
+        Reductions accumulate in float64; float32 einsum sums drift on long clips
         """
-        ai_score = 0.0
-        total_weight = 0.0
+        n = len(audio_data)
+        x = audio_data - audio_data.mean()
+        m2 = np.einsum('i,i->', x, x, dtype=np.float64) / n
         
+        if m2 <= 0:
+            return 0.0, 0.0
+        
+        m3 = np.einsum('i,i,i->', x, x, x, dtype=np.float64) / n
+        m4 = np.einsum('i,i,i,i->', x, x, x, x, dtype=np.float64) / n
+        return float(m4 / m2**2 - 3), float(m3 / m2**1.5)
+    
+    def _feature_vector(self, features: Features) -> np.ndarray:
+        """Indicator features in probability-weight order"""
+        return np.array([
+            features.spectral_flatness,
+            features.harmonic_ratio,
+            features.zcr_std,
+            features.jitter,
+            features.shimmer,
+            features.mfcc_variance,
+            features.energy_entropy,
+        ])
+    
+    def _evaluate_thresholds(self, features: Features) -> np.ndarray:
+        """
+        Boolean mask of indicators on the AI-like side of their threshold
+        Signed comparison: positive when the feature points towards AI
+        """
+        return self._directions * (self._feature_vector(features) - self._threshold_vector) > 0
+    
+    def _calculate_ai_probability(self, ai_mask: np.ndarray, language: str) -> float:
+        """
+        Calculate probability that the voice is AI-generated
+        Weighted share of indicators on the AI-like side of their threshold
+        """
         # Language-specific weight
         lang_weight = self.language_models.get(language, {}).get("phoneme_weight", 1.0)
-        
-        # Spectral flatness (higher = more AI-like)
-        if features['spectral_flatness'] > self.thresholds['spectral_flatness_threshold']:
-            ai_score += 2.0
-        total_weight += 2.0
-        
-        # Harmonic ratio (higher = more AI-like)
-        if features['harmonic_ratio'] > self.thresholds['harmonic_ratio_threshold']:
-            ai_score += 1.5
-        total_weight += 1.5
-        
-        # ZCR standard deviation (lower = more AI-like)
-        if features['zcr_std'] < self.thresholds['zero_crossing_rate_std']:
-            ai_score += 1.8 * lang_weight
-        total_weight += 1.8 * lang_weight
-        
-        # Jitter (lower = more AI-like)
-        if features['jitter'] < self.thresholds['jitter_threshold']:
-            ai_score += 2.2
-        total_weight += 2.2
-        
-        # Shimmer (lower = more AI-like)
-        if features['shimmer'] < self.thresholds['shimmer_threshold']:
-            ai_score += 2.0
-        total_weight += 2.0
-        
-        # MFCC variance (lower = more AI-like)
-        if features['mfcc_variance'] < self.thresholds['mel_cepstral_distortion']:
-            ai_score += 1.5
-        total_weight += 1.5
-        
-        # Energy entropy (lower = more AI-like for consistent energy)
-        if features['energy_entropy'] < 3.5:
-            ai_score += 1.0
-        total_weight += 1.0
+        weights = self._weights.copy()
+        weights[self._zcr_index] *= lang_weight
         
         # Normalize to probability
-        probability = ai_score / total_weight if total_weight > 0 else 0.5
-        
-        return probability
+        return float(weights[ai_mask].sum() / weights.sum())
     
-    def _generate_explanation(self, features: Dict, ai_probability: float, language: str) -> str:
+    def _generate_explanation(self, ai_mask: np.ndarray, ai_probability: float, language: str) -> str:
         """Generate human-readable explanation"""
         classification = "AI-generated" if ai_probability > 0.5 else "human-generated"
         confidence = ai_probability if ai_probability > 0.5 else (1 - ai_probability)
         
-        reasons = []
-        
         # Analyze key indicators
-        if features['spectral_flatness'] > self.thresholds['spectral_flatness_threshold']:
-            reasons.append("uniform spectral distribution")
-        
-        if features['jitter'] < self.thresholds['jitter_threshold']:
-            reasons.append("minimal pitch variation")
-        
-        if features['shimmer'] < self.thresholds['shimmer_threshold']:
-            reasons.append("consistent amplitude")
-        
-        if features['zcr_std'] < self.thresholds['zero_crossing_rate_std']:
-            reasons.append("stable zero-crossing rate")
-        
-        if features['harmonic_ratio'] > self.thresholds['harmonic_ratio_threshold']:
-            reasons.append("high harmonic content")
+        reasons = [reason for idx, reason, _ in AI_INDICATOR_LABELS if ai_mask[idx]]
         
         if not reasons:
             reasons = ["natural prosodic variation", "organic spectral characteristics"]
@@ -374,44 +628,13 @@ class VoiceDetector:
         
         return explanation
     
-    def _get_ai_indicators(self, features: Dict) -> list:
+    def _get_ai_indicators(self, ai_mask: np.ndarray) -> list:
         """Get list of indicators suggesting AI generation"""
-        indicators = []
-        
-        if features['spectral_flatness'] > self.thresholds['spectral_flatness_threshold']:
-            indicators.append("High spectral uniformity")
-        
-        if features['jitter'] < self.thresholds['jitter_threshold']:
-            indicators.append("Low pitch jitter")
-        
-        if features['shimmer'] < self.thresholds['shimmer_threshold']:
-            indicators.append("Low amplitude shimmer")
-        
-        if features['zcr_std'] < self.thresholds['zero_crossing_rate_std']:
-            indicators.append("Consistent zero-crossing rate")
-        
-        if features['harmonic_ratio'] > self.thresholds['harmonic_ratio_threshold']:
-            indicators.append("Strong harmonic structure")
-        
-        return indicators
+        return [label for idx, _, label in AI_INDICATOR_LABELS if ai_mask[idx]]
     
-    def _get_human_indicators(self, features: Dict) -> list:
+    def _get_human_indicators(self, ai_mask: np.ndarray) -> list:
         """Get list of indicators suggesting human speech"""
-        indicators = []
-        
-        if features['jitter'] > self.thresholds['jitter_threshold']:
-            indicators.append("Natural pitch variation")
-        
-        if features['shimmer'] > self.thresholds['shimmer_threshold']:
-            indicators.append("Natural amplitude variation")
-        
-        if features['zcr_std'] > self.thresholds['zero_crossing_rate_std']:
-            indicators.append("Variable articulation")
-        
-        if features['energy_entropy'] > 3.5:
-            indicators.append("Dynamic energy distribution")
-        
-        return indicators
+        return [label for idx, label in HUMAN_INDICATOR_LABELS if not ai_mask[idx]]
     
     def detect_language(self, audio_data: np.ndarray, sample_rate: int) -> str:
         """